@@ -1,5 +1,10 @@
 
-from typing import NewType, Dict, List, Callable, cast
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import NewType, Dict, List, Optional, Tuple, Callable, cast
+
+import numpy as np
+from numba import njit
 
 from labml import monit, tracker, logger, experiment
 from labml.configs import BaseConfigs, option
@@ -59,6 +64,20 @@ class History:
         """
         raise NotImplementedError()
 
+    def chance_actions(self) -> List[Action]:
+        """
+        All the chance events that can happen when $P(h) = c$.
+        """
+        raise NotImplementedError()
+
+    def chance_probabilities(self) -> List[float]:
+        """
+        Probabilities of the chance events in `chance_actions`, $\sigma_c(h, a)$.
+        They are equally likely by default.
+        """
+        n = len(self.chance_actions())
+        return [1 / n] * n
+
     def __add__(self, action: Action):
         """
         Add an action to the history.
@@ -94,24 +113,37 @@ class InfoSet:
 
     # Unique key identifying the information set
     key: str
-    
-    strategy: Dict[Action, float]
-    regret: Dict[Action, float]
-    
-    cumulative_strategy: Dict[Action, float]
+
+    # The values below are stored in arrays indexed by the position of the action in `_actions`
+    strategy: np.ndarray
+    regret: np.ndarray
+
+    cumulative_strategy: np.ndarray
+
+    # Tracking indicator names for each action, created by [`InfoSetTracker`](#InfoSetTracker)
+    _track_keys: Optional[Tuple[Tuple[str, str, str], ...]] = None
 
     def __init__(self, key: str):
         """
         Initialize
         """
         self.key = key
-        self.regret = {a: 0 for a in self.actions()}
-        self.cumulative_strategy = {a: 0 for a in self.actions()}
+        # Actions $A(I_i)$, their count $|A(I_i)|$ and a map from an action to its index
+        self._actions = tuple(self.actions())
+        self._n_actions = len(self._actions)
+        self._idx = {a: k for k, a in enumerate(self._actions)}
+        # Single precision, the same as the shared buffers of the compiled tree
+        self.regret = np.zeros(self._n_actions, dtype=np.float32)
+        self.cumulative_strategy = np.zeros(self._n_actions, dtype=np.float32)
+        self.strategy = np.empty(self._n_actions, dtype=np.float32)
         self.calculate_strategy()
 
     def actions(self) -> List[Action]:
         """
         Actions $A(I_i)$
+
+        This is only called once, when the information set is created;
+        the actions are kept in `_actions` after that.
         """
         raise NotImplementedError()
 
@@ -128,16 +160,16 @@ class InfoSet:
         """
         return {
             'key': self.key,
-            'regret': self.regret,
-            'average_strategy': self.cumulative_strategy,
+            'regret': dict(zip(self._actions, self.regret.tolist())),
+            'average_strategy': dict(zip(self._actions, self.cumulative_strategy.tolist())),
         }
 
     def load_dict(self, data: Dict[str, any]):
         """
         Load data from a saved dictionary
         """
-        self.regret = data['regret']
-        self.cumulative_strategy = data['average_strategy']
+        self.regret[:] = [data['regret'][a] for a in self._actions]
+        self.cumulative_strategy[:] = [data['average_strategy'][a] for a in self._actions]
         self.calculate_strategy()
 
     def calculate_strategy(self):
@@ -146,33 +178,26 @@ class InfoSet:
 
         Calculate current strategy using [regret matching](#RegretMatching).
         """
-        regret = {a: max(r, 0) for a, r in self.regret.items()}
-        regret_sum = sum(regret.values())
+        regret = np.maximum(self.regret, 0)
+        regret_sum = regret.sum()
+        # The strategy is updated in place, so that any views of it stay valid
         if regret_sum > 0:
-            
-            self.strategy = {a: r / regret_sum for a, r in regret.items()}
+            self.strategy[:] = regret / regret_sum
         # Otherwise,
         else:
-            count = len(list(a for a in self.regret))
-            
-            self.strategy = {a: 1 / count for a, r in regret.items()}
+            self.strategy[:] = 1 / self._n_actions
 
     def get_average_strategy(self):
         """
         ## Get average strategy
 
         """
-        cum_strategy = {a: self.cumulative_strategy.get(a, 0.) for a in self.actions()}
-       
-        strategy_sum = sum(cum_strategy.values())
+        strategy_sum = self.cumulative_strategy.sum()
         if strategy_sum > 0:
-           
-            return {a: s / strategy_sum for a, s in cum_strategy.items()}
+            return self.cumulative_strategy / strategy_sum
         # Otherwise,
         else:
-            count = len(list(a for a in cum_strategy))
-            
-            return {a: 1 / count for a, r in cum_strategy.items()}
+            return np.full_like(self.cumulative_strategy, 1 / self._n_actions)
 
     def __repr__(self):
         """
@@ -181,6 +206,157 @@ class InfoSet:
         raise NotImplementedError()
 
 
+# Kinds of nodes in the [compiled](#_compile_tree) game tree
+_TERMINAL = 0
+_CHANCE = 1
+_PLAYER = 2
+
+
+@njit(cache=True)
+def _seed(seed):
+    """
+    Seed the random number generator used by the compiled walks.
+    Numba keeps its own generator state, so `np.random.seed` from Python doesn't affect it.
+    """
+    np.random.seed(seed)
+
+
+@njit(cache=True, nogil=True)
+def _sample(cumprob):
+    """
+    Sample an index from a distribution given its cumulative probabilities
+    """
+    a = np.searchsorted(cumprob, np.random.random() * cumprob[-1], side='right')
+    # Guard against rounding errors at the top end
+    return min(a, len(cumprob) - 1)
+
+
+@njit(cache=True, nogil=True)
+def _walk(node, i, depth,
+          node_kind, player_id, n_actions, first_child, info_set_offset, term_util, chance_cumprob,
+          regret, cum_strategy, strategy, scratch):
+    """
+    <a id="_walk"></a>
+
+    ### Walk the compiled game tree
+
+    This walks the game tree rooted at `node` with
+    [external sampling](http://mlanctot.info/files/papers/nips09mccfr.pdf) and returns
+    the sampled expected utility of player $i$.
+    All the actions of player $i$ are explored, while chance events and the actions
+    of the other players are sampled.
+
+    Regrets of player $i$'s information sets, and the cumulative strategies of the information sets
+    of other players are updated.
+    Since the other players' actions and chance events are sampled,
+    the values don't need to be weighted by $\pi^\sigma_{-i}(h)$.
+
+    The information set values are stored in `regret`, `cum_strategy` and `strategy`,
+    starting at `info_set_offset[node]`.
+    `scratch[depth]` holds the action values of the node at `depth`, so no arrays are allocated
+    during the walk.
+    """
+    kind = node_kind[node]
+    # If it's a terminal history return the terminal utility $u_i(h)$
+    if kind == _TERMINAL:
+        return term_util[node, i]
+    n = n_actions[node]
+    # The child for action $a$ is `child + a`
+    child = first_child[node]
+    # If it's a chance event sample one and go to the next step
+    if kind == _CHANCE:
+        return _walk(child + _sample(chance_cumprob[child:child + n]), i, depth + 1,
+                     node_kind, player_id, n_actions, first_child, info_set_offset, term_util, chance_cumprob,
+                     regret, cum_strategy, strategy, scratch)
+
+    offset = info_set_offset[node]
+    # If another player is acting, accumulate their strategy and sample an action from it
+    if player_id[node] != i:
+        for k in range(n):
+            cum_strategy[offset + k] += strategy[offset + k]
+        # Inverse CDF sampling with a running sum, falling back to the last action on rounding errors
+        u = np.random.random()
+        a = n - 1
+        for k in range(n):
+            u -= strategy[offset + k]
+            if u < 0:
+                a = k
+                break
+        return _walk(child + a, i, depth + 1,
+                     node_kind, player_id, n_actions, first_child, info_set_offset, term_util, chance_cumprob,
+                     regret, cum_strategy, strategy, scratch)
+
+    # Expected value $v_i(\sigma, h)$ and the values $v_i(\sigma, h \cdot a)$ of each action
+    v = 0.
+    va = scratch[depth]
+    for a in range(n):
+        va[a] = _walk(child + a, i, depth + 1,
+                      node_kind, player_id, n_actions, first_child, info_set_offset, term_util, chance_cumprob,
+                      regret, cum_strategy, strategy, scratch)
+        v += strategy[offset + a] * va[a]
+
+    # Update the regrets of player $i$.
+    # The strategy itself is only recomputed once per iteration, in `CFR.iterate`.
+    for a in range(n):
+        regret[offset + a] += va[a] - v
+
+    return v
+
+
+@njit(cache=True, nogil=True)
+def _walk_binary(node, i,
+                 node_kind, player_id, n_actions, first_child, info_set_offset, term_util, chance_cumprob,
+                 regret, cum_strategy, strategy):
+    """
+    ### Walk a compiled game tree with two actions per information set
+
+    This is the same as [`_walk`](#_walk), specialized for games like Kuhn poker where every
+    information set has exactly two actions.
+    The strategy at a node is a single probability $p$ of taking the first action,
+    so the walk needs no loops over actions or scratch space.
+    """
+    kind = node_kind[node]
+    # If it's a terminal history return the terminal utility $u_i(h)$
+    if kind == _TERMINAL:
+        return term_util[node, i]
+    # The children for the two actions are `child` and `child + 1`.
+    # This is widened to the type of the other node ids, so that every recursive call
+    # has the same signature; Numba can't reload mutually recursive signatures from its cache.
+    child = np.int64(first_child[node])
+    # If it's a chance event sample one and go to the next step
+    if kind == _CHANCE:
+        n = n_actions[node]
+        return _walk_binary(child + _sample(chance_cumprob[child:child + n]), i,
+                            node_kind, player_id, n_actions, first_child, info_set_offset, term_util,
+                            chance_cumprob, regret, cum_strategy, strategy)
+
+    offset = info_set_offset[node]
+    p = strategy[offset]
+    # If another player is acting, accumulate their strategy and sample an action from it
+    if player_id[node] != i:
+        cum_strategy[offset] += p
+        cum_strategy[offset + 1] += 1. - p
+        a = 0 if np.random.random() < p else 1
+        return _walk_binary(child + a, i,
+                            node_kind, player_id, n_actions, first_child, info_set_offset, term_util,
+                            chance_cumprob, regret, cum_strategy, strategy)
+
+    # Values of the two actions and the expected value $v_i(\sigma, h)$
+    v0 = _walk_binary(child, i,
+                      node_kind, player_id, n_actions, first_child, info_set_offset, term_util,
+                      chance_cumprob, regret, cum_strategy, strategy)
+    v1 = _walk_binary(child + 1, i,
+                      node_kind, player_id, n_actions, first_child, info_set_offset, term_util,
+                      chance_cumprob, regret, cum_strategy, strategy)
+    v = p * v0 + (1. - p) * v1
+
+    # Update the regrets of player $i$
+    regret[offset] += v0 - v
+    regret[offset + 1] += v1 - v
+
+    return v
+
+
 class CFR:
    
     info_sets: Dict[str, InfoSet]
@@ -188,14 +364,34 @@ class CFR:
     def __init__(self, *,
                  create_new_history: Callable[[], History],
                  epochs: int,
-                 n_players: int = 2):
+                 n_players: int = 2,
+                 alpha: float = 1.5,
+                 beta: float = 0.0,
+                 gamma: float = 2.0,
+                 track_every: int = 1_000,
+                 n_workers: int = 1,
+                 seed: Optional[int] = None):
         """
         * `create_new_history` creates a new empty history
         * `epochs` is the number of iterations to train on $T$
         * `n_players` is the number of players
+        * `alpha`, `beta` and `gamma` are the [Discounted CFR](#discount) parameters
+        * `track_every` is the number of iterations between tracking information sets
+        * `n_workers` is the number of threads to walk the tree for different players in parallel;
+         it's capped at `n_players`
+        * `seed` seeds the sampling in the walks; runs are only reproducible with a single worker,
+         since each thread has its own generator
         """
         self.n_players = n_players
         self.epochs = epochs
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.track_every = track_every
+        # Number of iterations trained so far, across calls to `iterate`, for the [discount](#discount)
+        self._t = 0
+        self.n_workers = n_workers
+        self.seed = seed
         self.create_new_history = create_new_history
         # A dictionary for $\mathcal{I}$ set of all information sets
         self.info_sets = {}
@@ -211,9 +407,177 @@ class CFR:
             self.info_sets[info_set_key] = h.new_info_set()
         return self.info_sets[info_set_key]
 
-    #TODO: Imlement this function right here according to the cfr algorithm
-    def walk_tree(self, h: History, i: Player, pi_1: float, pi_2: float) -> float:
-        ...
+    def _compile_tree(self):
+        """
+        ### Compile the game tree
+
+        The game tree is walked once and flattened into arrays, so that
+        [`_walk`](#_walk) can traverse it without creating any `History` objects.
+        Each history gets an integer id and the children of a node get consecutive ids,
+        so the child for the $k$-th action is `first_child[node] + k`.
+        Terminal utilities and chance probabilities are constants of the game,
+        so they are also looked up once and stored in tables.
+
+        This also discovers all the information sets and allocates their regrets and strategies
+        in shared buffers; each `InfoSet` holds views of its own slice of those.
+        """
+        histories = [self.create_new_history()]
+        node_kind, player_id, n_actions, first_child, info_set_offset, term_util = [], [], [], [], [], []
+        # Probability of each chance event, stored at the id of the node it leads to
+        chance_prob = [0.]
+        # Depth of each node
+        depth = [0]
+        # Offsets of the information sets in the shared buffers
+        offsets: Dict[InfoSet, int] = {}
+        total = 0
+
+        # Children are appended together, so siblings always have consecutive ids
+        node = 0
+        while node < len(histories):
+            h = histories[node]
+            offset = -1
+            utility = [0.] * self.n_players
+            if h.is_terminal():
+                kind, actions, player = _TERMINAL, [], -1
+                utility = [h.terminal_utility(cast(Player, p)) for p in range(self.n_players)]
+            elif h.is_chance():
+                kind, actions, player = _CHANCE, h.chance_actions(), -1
+            else:
+                I = self._get_info_set(h)
+                if I not in offsets:
+                    offsets[I] = total
+                    total += I._n_actions
+                kind, actions, player, offset = _PLAYER, I._actions, h.player(), offsets[I]
+
+            node_kind.append(kind)
+            player_id.append(player)
+            n_actions.append(len(actions))
+            first_child.append(len(histories))
+            info_set_offset.append(offset)
+            term_util.append(utility)
+            histories.extend(h + a for a in actions)
+            depth.extend(depth[node] + 1 for _ in actions)
+            if kind == _CHANCE:
+                chance_prob.extend(h.chance_probabilities())
+            else:
+                chance_prob.extend(0. for _ in actions)
+            node += 1
+
+        self._node_kind = np.array(node_kind, dtype=np.int32)
+        self._player_id = np.array(player_id, dtype=np.int32)
+        self._node_n_actions = np.array(n_actions, dtype=np.int32)
+        self._first_child = np.array(first_child, dtype=np.int32)
+        self._info_set_offset = np.array(info_set_offset, dtype=np.int32)
+        self._term_util = np.array(term_util, dtype=np.float64)
+        self._chance_prob = np.array(chance_prob, dtype=np.float64)
+        # Cumulative probabilities of the chance events at each chance node, for sampling
+        self._chance_cumprob = np.zeros_like(self._chance_prob)
+        for node in np.flatnonzero(self._node_kind == _CHANCE):
+            child, n = self._first_child[node], self._node_n_actions[node]
+            self._chance_cumprob[child:child + n] = np.cumsum(self._chance_prob[child:child + n])
+        # Whether every information set has two actions, so the [binary walk](#_walk_binary) can be used
+        self._binary = bool(np.all(self._node_n_actions[self._node_kind == _PLAYER] == 2))
+        # Scratch space for action values of each player's walk, one row per depth
+        self._scratch = np.zeros((self.n_players, max(depth) + 1, max(n_actions)), dtype=np.float32)
+
+        # Shared buffers for regrets, cumulative strategies and current strategies.
+        # Regret matching doesn't need double precision, and single precision halves
+        # the memory traffic of the sweeps over these buffers.
+        self._regret = np.zeros(total, dtype=np.float32)
+        self._cum_strategy = np.zeros(total, dtype=np.float32)
+        self._strategy = np.zeros(total, dtype=np.float32)
+        # Updates from each player's walk, when walking in parallel
+        self._regret_delta = np.zeros((self.n_players, total), dtype=np.float32)
+        self._cum_strategy_delta = np.zeros((self.n_players, total), dtype=np.float32)
+        # Keys of the information sets in buffer order, the start of each one's slice,
+        # the slice every entry belongs to, and the uniform strategy for every entry
+        self._keys = [I.key for I in offsets]
+        self._starts = np.array(list(offsets.values()), dtype=np.int64)
+        self._segment = np.zeros(total, dtype=np.int64)
+        self._uniform = np.zeros(total, dtype=np.float32)
+        for j, (I, offset) in enumerate(offsets.items()):
+            n = I._n_actions
+            self._segment[offset:offset + n] = j
+            self._uniform[offset:offset + n] = 1 / n
+            self._regret[offset:offset + n] = I.regret
+            self._cum_strategy[offset:offset + n] = I.cumulative_strategy
+            I.regret = self._regret[offset:offset + n]
+            I.cumulative_strategy = self._cum_strategy[offset:offset + n]
+            I.strategy = self._strategy[offset:offset + n]
+            I.calculate_strategy()
+
+    def walk_tree(self, i: Player,
+                  regret: Optional[np.ndarray] = None,
+                  cum_strategy: Optional[np.ndarray] = None) -> float:
+        """
+        ### Walk Tree
+
+        Walk the [compiled](#_compile_tree) game tree from the root for player $i$
+        and return the sampled expected utility of player $i$.
+
+        Regret and cumulative strategy updates are added to `regret` and `cum_strategy`,
+        which default to the shared buffers.
+        """
+        if regret is None:
+            regret = self._regret
+        if cum_strategy is None:
+            cum_strategy = self._cum_strategy
+        if self._binary:
+            return _walk_binary(0, i,
+                                self._node_kind, self._player_id, self._node_n_actions, self._first_child,
+                                self._info_set_offset, self._term_util, self._chance_cumprob,
+                                regret, cum_strategy, self._strategy)
+        return _walk(0, i, 0,
+                     self._node_kind, self._player_id, self._node_n_actions, self._first_child,
+                     self._info_set_offset, self._term_util, self._chance_cumprob,
+                     regret, cum_strategy, self._strategy, self._scratch[i])
+
+    def _walk_parallel(self, pool: ThreadPoolExecutor):
+        """
+        ### Walk the tree for all players in parallel
+
+        `_walk` releases the GIL, so the walks run concurrently.
+        Each walk adds its updates to its own buffers, which are summed into the shared buffers
+        once all walks are done.
+        """
+        self._regret_delta[:] = 0
+        self._cum_strategy_delta[:] = 0
+        list(pool.map(lambda i: self.walk_tree(cast(Player, i), self._regret_delta[i], self._cum_strategy_delta[i]),
+                      range(self.n_players)))
+        self._regret += self._regret_delta.sum(axis=0)
+        self._cum_strategy += self._cum_strategy_delta.sum(axis=0)
+
+    def _calculate_strategies(self):
+        """
+        ### Calculate strategies of all information sets
+
+        This does [regret matching](#RegretMatching) for all information sets at once
+        on the shared buffers; it's the same as calling `calculate_strategy` on each of them.
+        """
+        regret = np.maximum(self._regret, 0)
+        # $\sum_{a'\in A(I)} R^{T,+}_i(I, a')$ repeated for each action of $I$
+        regret_sum = np.add.reduceat(regret, self._starts)[self._segment]
+        # Use the uniform strategy where the regrets are all non-positive
+        self._strategy[:] = self._uniform
+        np.divide(regret, regret_sum, out=self._strategy, where=regret_sum > 0)
+
+    def _discount(self, t: int):
+        """
+        <a id="discount"></a>
+
+        ### Discount regrets and the cumulative strategy
+
+        This is [Discounted CFR](https://arxiv.org/abs/1809.04040) weighting, applied after iteration $t$.
+        Positive regrets are multiplied by $\frac{t^\alpha}{t^\alpha + 1}$,
+        negative regrets by $\frac{t^\beta}{t^\beta + 1}$
+        and the cumulative strategy by $\Big(\frac{t}{t + 1}\Big)^\gamma$.
+        """
+        pos_w = t ** self.alpha / (t ** self.alpha + 1)
+        neg_w = t ** self.beta / (t ** self.beta + 1)
+        strat_w = (t / (t + 1)) ** self.gamma
+        # Update the shared buffers in place, so that the information set views stay valid
+        self._regret *= np.where(self._regret > 0, pos_w, neg_w)
+        self._cum_strategy *= strat_w
 
     def iterate(self):
         """
@@ -222,28 +586,81 @@ class CFR:
         This updates the strategies for $T$ iterations.
         """
 
-        # Loop for `epochs` times
-        for t in monit.iterate('Train', self.epochs):
-            # Walk tree and update regrets for each player
-            for i in range(self.n_players):
-                self.walk_tree(self.create_new_history(), cast(Player, i), 1, 1)
-
-            # Track data for analytics
-            tracker.add_global_step()
-            self.tracker(self.info_sets)
-            tracker.save()
-
-            # Save checkpoints every $1,000$ iterations
-            if (t + 1) % 1_000 == 0:
-                experiment.save_checkpoint()
-
-        # Print the information sets
-        logger.inspect(self.info_sets)
+        # Flatten the game tree once before training
+        self._compile_tree()
+        # Seed chance and opponent sampling
+        if self.seed is not None:
+            _seed(self.seed)
+
+        # Progress and tracker saves are only written every `report_every` iterations,
+        # since the labml calls cost more than an iteration on small games
+        report_every = max(1, self.epochs // 1_000)
+
+        # Thread pool to walk the tree for the players in parallel
+        # There is one walk per player, so more workers than players would be idle
+        n_workers = min(self.n_workers, self.n_players)
+        pool_context = ThreadPoolExecutor(n_workers) if n_workers > 1 else nullcontext()
+        with pool_context as pool, monit.section('Train'):
+            # Loop for `epochs` times
+            for t in range(self.epochs):
+                # Calculate the strategies $\sigma^t$ for this iteration from the regrets
+                self._calculate_strategies()
+                # Walk tree and update regrets for each player
+                if pool is None:
+                    for i in range(self.n_players):
+                        self.walk_tree(cast(Player, i))
+                else:
+                    self._walk_parallel(pool)
+                # Discount the accumulated values
+                self._t += 1
+                self._discount(self._t)
+
+                # Track data for analytics.
+                # The global step is advanced every iteration so values are saved at the right step.
+                tracker.set_global_step(t + 1)
+                if t % self.track_every == 0:
+                    self.tracker(self.info_sets)
+                    tracker.save()
+                elif (t + 1) % report_every == 0:
+                    tracker.save()
+                if (t + 1) % report_every == 0:
+                    monit.progress((t + 1) / self.epochs)
+
+                # Save checkpoints every $1,000$ iterations
+                if (t + 1) % 1_000 == 0:
+                    experiment.save_checkpoint()
+
+            # Write out the last partial block of iterations
+            if self.epochs % report_every != 0:
+                tracker.save()
+                monit.progress(1.)
+
+        # Print a summary; use [`export`](#export) to save the learned values
+        regret = np.maximum(self._regret, 0)
+        logger.log(f'{len(self.info_sets):,} information sets, '
+                   f'mean positive regret {regret.mean():.6f}')
+
+    def export(self, path: str):
+        """
+        <a id="export"></a>
+
+        ### Export the learned values
+
+        Saves the shared buffers to a compressed `.npz` file.
+        The values of the $j$-th information set in `keys` start at `starts[j]`.
+        """
+        np.savez_compressed(path,
+                            regret=self._regret,
+                            cum=self._cum_strategy,
+                            keys=np.array(self._keys),
+                            starts=self._starts)
 
 
 
 class InfoSetTracker:
     """
+    <a id="InfoSetTracker"></a>
+
     ### Information set tracker
 
     This is a small helper class to track data from information sets
@@ -260,14 +677,19 @@ class InfoSetTracker:
         """
         Track the data from all information sets
         """
+        values = {}
         for I in info_sets.values():
+            # Indicator names are only formatted the first time an information set is tracked
+            if I._track_keys is None:
+                I._track_keys = tuple((f'strategy.{I.key}.{a}',
+                                       f'average_strategy.{I.key}.{a}',
+                                       f'regret.{I.key}.{a}') for a in I._actions)
             avg_strategy = I.get_average_strategy()
-            for a in I.actions():
-                tracker.add({
-                    f'strategy.{I.key}.{a}': I.strategy[a],
-                    f'average_strategy.{I.key}.{a}': avg_strategy[a],
-                    f'regret.{I.key}.{a}': I.regret[a],
-                })
+            for k, (strategy_key, average_key, regret_key) in enumerate(I._track_keys):
+                values[strategy_key] = I.strategy[k]
+                values[average_key] = avg_strategy[k]
+                values[regret_key] = I.regret[k]
+        tracker.add(values)
 
 
 class CFRConfigs(BaseConfigs):
@@ -276,6 +698,17 @@ class CFRConfigs(BaseConfigs):
     """
     create_new_history: Callable[[], History]
     epochs: int = 1_00_000
+    # [Discounted CFR](#discount) parameters
+    alpha: float = 1.5
+    beta: float = 0.0
+    gamma: float = 2.0
+    # Number of iterations between tracking information sets
+    track_every: int = 1_000
+    # Number of threads to walk the tree with, at most one per player.
+    # This slows Kuhn poker down, since a walk is too short to be worth handing off to a thread.
+    n_workers: int = 1
+    # Seed for sampling chance events and opponent actions
+    seed: Optional[int] = None
     cfr: CFR = 'simple_cfr'
 
 
@@ -285,4 +718,10 @@ def simple_cfr(c: CFRConfigs):
     Initialize **CFR** algorithm
     """
     return CFR(create_new_history=c.create_new_history,
-               epochs=c.epochs)
+               epochs=c.epochs,
+               alpha=c.alpha,
+               beta=c.beta,
+               gamma=c.gamma,
+               track_every=c.track_every,
+               n_workers=c.n_workers,
+               seed=c.seed)
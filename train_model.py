@@ -72,9 +72,9 @@ class InfoSet(_InfoSet):
         """
         Human readable string representation - it gives the betting probability
         """
-        total = sum(self.cumulative_strategy.values())
+        total = self.cumulative_strategy.sum()
         total = max(total, 1e-6)
-        bet = self.cumulative_strategy[cast(Action, 'b')] / total
+        bet = self.cumulative_strategy[self._idx[cast(Action, 'b')]] / total
         return f'{bet * 100: .1f}%'
 
 
@@ -184,6 +184,12 @@ class History(_History):
             if chance is not None:
                 return cast(Action, chance)
 
+    def chance_actions(self) -> List[Action]:
+        """
+        The cards that are yet to be dealt
+        """
+        return [c for c in CHANCES if c not in self.history]
+
     def __repr__(self):
         """
         Human readable representation